@@ -0,0 +1,25 @@
+"""
+Optional build script.
+
+When Cython is installed (and a C compiler is present), `python setup.py build_ext --inplace` compiles
+src/html_text.py into a C extension, so the per-tag parser callbacks (handle_starttag, handle_endtag,
+handle_data) run as native code instead of interpreted Python. Without Cython the plain .py module
+is used as-is - no functionality depends on the compiled variant.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+    # src/fast_count.py must stay interpreted: numba cannot JIT functions from a Cython-compiled module.
+    ext_modules = cythonize(["src/html_text.py"],
+                            compiler_directives={"language_level": "3", "infer_types": True})
+except ImportError:
+    ext_modules = []
+
+setup(
+    name="volvo-html-text",
+    version="1.0",
+    packages=["src"],
+    ext_modules=ext_modules,
+)
@@ -0,0 +1,35 @@
+"""
+Optional numba-accelerated counting helper.
+
+Kept in its own module, deliberately not compiled by setup.py: numba can only JIT functions that carry
+real Python bytecode, which Cython-compiled modules do not have, so the helper must stay interpreted
+for the two optional accelerators to work side by side.
+
+`count_sorted_ids` is None when numba (or numpy) is not installed.
+"""
+
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def count_sorted_ids(ids):
+        """Run-length encode a sorted array of token ids. Return arrays of unique ids and their counts."""
+        unique = np.empty(ids.size, dtype=np.uint64)
+        counts = np.empty(ids.size, dtype=np.int64)
+        n = 0
+        i = 0
+        while i < ids.size:
+            j = i + 1
+            while j < ids.size and ids[j] == ids[i]:
+                j += 1
+            unique[n] = ids[i]
+            counts[n] = j - i
+            n += 1
+            i = j
+        return unique[:n], counts[:n]
+else:
+    count_sorted_ids = None
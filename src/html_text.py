@@ -4,15 +4,58 @@ Present most frequent words in given HTML page.
 Please, refer to README.md file for detailed task description and implementation notes.
 """
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from html.parser import HTMLParser
+import io
 import os
 import re
 from urllib import request
 
+from src.fast_count import count_sorted_ids
 from src.logger import log
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-TAGS_TO_EXCLUDE = ('!--', 'audio', 'canvas', 'iframe', 'noscript', 'script', 'source', 'style', 'title', 'video')
+
+TAGS_TO_EXCLUDE = frozenset({'!--', 'audio', 'canvas', 'iframe', 'noscript', 'script', 'source', 'style', 'title',
+                             'video'})
+
+# Translation table for remove_extra_characters: single characters replaced by space.
+_SYMBOLS_TRANSLATION = str.maketrans({'?': ' ', '!': ' ', ':': ' ', ';': ' ', '-': ' ', '[': ' ', ']': ' ',
+                                      '{': ' ', '}': ' ', '(': ' ', ')': ' ', '"': ' ', '\n': ' ', '\t': ' '})
+
+# Ellipsis, and period or comma that is not a part of large or float number representation, replaced by
+# space in one scan. Applied after '&nbsp;' and apostrophe removal, so digit adjacency is judged on the
+# cleaned text.
+_EXTRA_PATTERN = re.compile(r'\.\.\.|(?<!\d)[.,](?!\d)')
+
+
+# Word token: a run of non-separator characters. Period and comma count as part of a word only when
+# adjacent to a digit (number representations like 1,000 or 12.34).
+_WORD_PATTERN = re.compile(r"(?:[^\s?!:;\-\[\]{}()\"'.,]|(?<=\d)[.,]|[.,](?=\d))+")
+
+# Non-ASCII whitespace (no-break space and friends) that str.split treats as a separator. Mapped to a
+# plain space before byte-level processing, where multi-byte characters cannot be classified.
+_UNICODE_WHITESPACE_TRANSLATION = str.maketrans(dict.fromkeys(
+    '\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000', ' '))
+
+if np is not None:
+    # Byte-level lookup tables for the fused normalize + tokenize path. UTF-8 continuation bytes are
+    # >= 0x80 and never classified as separators, so byte-wise classification is safe for unicode text.
+    _SEPARATOR_BYTES = np.zeros(256, dtype=bool)
+    _DIGIT_BYTES = np.zeros(256, dtype=bool)
+    for _byte in ('?!:;-[]{}()" \n\t\r\x0b\x0c\x1c\x1d\x1e\x1f'.encode()):
+        _SEPARATOR_BYTES[_byte] = True
+    for _byte in b'0123456789':
+        _DIGIT_BYTES[_byte] = True
+
+# Word lists below this size are counted with Counter; the JIT-compiled path only pays off on large corpora.
+_NUMBA_WORDS_THRESHOLD = 100_000
 
 
 class HtmlText(HTMLParser):
@@ -22,57 +65,106 @@ class HtmlText(HTMLParser):
         """
         Initialize HTMLParser and class attributes.
 
+        The class keeps no document state between calls - loaded documents and extracted text are passed
+        around as values, so intermediate strings are reclaimed as soon as they fall out of scope and one
+        instance can safely process many pages. The helper attributes below only carry state while feed()
+        is running and are cleared at the end of every parse.
+
         Attributes:
-        document_content - Designed to store the whole currently loaded document.
-        parsed_text - Visible text extracted from the document.
         _tags - Helper attribute, used during document parsing. Stack of currently opened tags.
                 Contains tuples: (tag name, is the tag hidden?)
+        _parsed_chunks - Helper attribute, used during document parsing. Collects visible text chunks,
+                         joined into the result once parsing is finished.
+        _skip_depth - Helper attribute, used during document parsing. Number of currently opened tags
+                      that are excluded or hidden. Text is visible only when it is zero.
+        _visible - Helper attribute, used during document parsing. Cached `_skip_depth == 0`, kept up to
+                   date by the tag handlers so handle_data performs a single boolean check.
         """
         log.debug("Initialize HTMLText class.")
         super().__init__()
-        self.document_content = ""
         self._tags = [("", False)]
-        self.parsed_text = ""
+        self._parsed_chunks: list[str] = []
+        self._skip_depth = 0
+        self._visible = True
+
+    @staticmethod
+    def load_from_url(url: str) -> io.TextIOWrapper:
+        """
+        Open HTML page from given url. Return an open text stream with the page body.
 
-    def load_from_url(self, url: str) -> None:
-        """Load HTML page from given url."""
+        The body is read lazily, during document parse, so the whole page is never buffered in memory.
+        """
         response = request.urlopen(url)
         assert response.code == 200, (f"Unable to get page from url {url}. Validate it correctness "
                                       f"and check your internet connection.")
-        self.document_content = response.read().decode('utf-8')
-        log.info(f"Successfully loaded document from url: {url}.")
+        log.info(f"Successfully opened document from url: {url}.")
+        return io.TextIOWrapper(response, encoding='utf-8', errors='replace')
 
-    def load_from_file(self, path: str) -> None:
-        """Load HTML document from given path."""
+    @staticmethod
+    def load_from_file(path: str) -> str:
+        """Load HTML document from given path. Return the document content."""
         assert os.path.isfile(path), f"Provided path {path} does not point to the existing file."
         with open(path, encoding="utf-8") as f:
-            self.document_content = f.read()
+            document = f.read()
         log.info(f"Successfully loaded document from file: {path}.")
+        return document
+
+    def parse_document(self, document: str | io.TextIOBase) -> str:
+        """
+        Parse given HTML document. Remove HTML tags and return the remaining visible text.
 
-    def parse_document(self) -> None:
-        """Parse currently loaded document. Remove HTML tags and store remaining text to parsed_text attribute."""
+        :param document: Either the whole document as a string (as returned by load_from_file), or an open
+                         text stream (as returned by load_from_url). A stream is fed to the parser in
+                         buffered chunks, overlapping network I/O with parsing and keeping peak memory
+                         independent of the page size.
+        :return: Visible text extracted from the document.
+        """
+        self.reset()
+        self._tags = [("", False)]
+        self._parsed_chunks = []
+        self._skip_depth = 0
+        self._visible = True
+        if isinstance(document, str):
+            self.feed(document)
+        else:
+            with document as stream:
+                while chunk := stream.read(65536):
+                    self.feed(chunk)
+        self.close()
+        parsed_text = "".join(self._parsed_chunks)
+        self._parsed_chunks = []
         self._tags = [("", False)]
-        self.parsed_text = ""
-        self.feed(self.document_content)
-        log.info(f"Text extraction done. Text contain {len(self.parsed_text)} characters.")
-        log.debug(f"Text extracted from HTML document: {self.parsed_text}")
+        log.info(f"Text extraction done. Text contain {len(parsed_text)} characters.")
+        log.debug("Text extracted from HTML document: %s", parsed_text)
+        return parsed_text
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str]]) -> None:
         """Add encountered opening tag to the stack. Used by feed method during HTML document parse."""
-        hidden = True if 'hidden' in [attr[0] for attr in attrs] else False
+        hidden = any(attr[0] == 'hidden' for attr in attrs)
         self._tags.append((tag, hidden))
-        log.debug(f"Read opening tag: {tag} with attributes {attrs}. Current tags stack: {self._tags}")
+        if hidden or tag in TAGS_TO_EXCLUDE:
+            self._skip_depth += 1
+            self._visible = False
+        log.debug("Read opening tag: %s with attributes %s. Current tags stack: %s", tag, attrs, self._tags)
 
     def handle_endtag(self, tag: str) -> None:
         """Remove encountered closing tag from the stack. Used by feed method during HTML document parse."""
-        while tag != self._tags.pop()[0]:
-            log.debug(f"Closing tag *{tag}* does not match to the last tag in stack.")
-        log.debug(f"Read closing tag: {tag}. Current tags stack: {self._tags}")
+        for i in range(len(self._tags) - 1, 0, -1):
+            if self._tags[i][0] == tag:
+                for popped_tag, popped_hidden in self._tags[i:]:
+                    if popped_hidden or popped_tag in TAGS_TO_EXCLUDE:
+                        self._skip_depth -= 1
+                self._visible = not self._skip_depth
+                del self._tags[i:]
+                break
+        else:
+            log.debug("Closing tag *%s* does not match any tag in stack.", tag)
+        log.debug("Read closing tag: %s. Current tags stack: %s", tag, self._tags)
 
     def handle_data(self, raw_text: str) -> None:
-        """Check if data between tags is a visible text. If so, add to it parsed_text string."""
-        if self._tags[-1][0] not in TAGS_TO_EXCLUDE and self._tags[-1][1] is False:
-            self.parsed_text += raw_text
+        """Check if data between tags is a visible text. If so, collect it for parsed_text."""
+        if self._visible:
+            self._parsed_chunks.append(raw_text)
 
     @staticmethod
     def remove_extra_characters(text: str) -> str:
@@ -88,23 +180,57 @@ class HtmlText(HTMLParser):
         Note: Returned text may contain multiple spaces between words. It is OK, as the parsed_text is only
               supposed to be subject of tokenization.
         """
-        symbols_to_remove = ('&nbsp;', "'")
-        for symbol in symbols_to_remove:
-            text = text.replace(symbol, '')
-        symbols_to_replace = ('?', '!', ':', ';', '-', '[', ']', '{', '}', '(', ')', "'", '"', '...', '\n', '\t')
-        for symbol in symbols_to_replace:
-            text = text.replace(symbol, ' ')
-        nan_pattern = r'((?<!\d))[.,]((?!\d))'
-        text = re.sub(nan_pattern, r'\1 \2', text)
-        return text
+        text = text.replace('&nbsp;', '').replace("'", '')
+        text = _EXTRA_PATTERN.sub(' ', text)
+        return text.translate(_SYMBOLS_TRANSLATION)
 
     @staticmethod
     def tokenize(text: str) -> list[str]:
         """Split given text into separate words. All words are converted to lowercase."""
-        words = text.split()
-        words = [word.lower() for word in words]
+        words = text.lower().split()
+        log.info(f"Tokenization. Page contain {len(words)} words.")
+        log.debug("Extracted words: %s", words)
+        return words
+
+    @staticmethod
+    def extract_words(text: str) -> list[str]:
+        """
+        Extract lowercase words straight from given text in a single regex scan.
+
+        Produces the same word list as tokenize(remove_extra_characters(text)), without building
+        the intermediate punctuation-stripped copy of the whole document.
+        """
+        text = text.replace('&nbsp;', '').lower().replace("'", '').replace('...', ' ')
+        words = _WORD_PATTERN.findall(text)
+        log.info(f"Tokenization. Page contain {len(words)} words.")
+        return words
+
+    @staticmethod
+    def _normalize_and_tokenize_numpy(text: str) -> list[str]:
+        """
+        Combined remove_extra_characters + tokenize in one pass. Used when numpy is available.
+
+        Instead of rewriting the whole text and splitting it afterwards (two full passes), classify the
+        document bytes with vectorized lookup tables and slice the words out directly. Gives the same
+        word list as tokenize(remove_extra_characters(text)).
+        """
+        text = (text.replace('&nbsp;', '').lower().replace("'", '').replace('...', ' ')
+                .translate(_UNICODE_WHITESPACE_TRANSLATION))
+        buf = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+        separator = _SEPARATOR_BYTES[buf]
+        digit = _DIGIT_BYTES[buf]
+        dot_comma = (buf == ord('.')) | (buf == ord(','))
+        neighbour_digit = np.zeros_like(digit)
+        neighbour_digit[1:] = digit[:-1]
+        neighbour_digit[:-1] |= digit[1:]
+        separator |= dot_comma & ~neighbour_digit
+        padded = np.ones(separator.size + 2, dtype=np.int8)
+        padded[1:-1] = separator
+        boundaries = np.flatnonzero(np.diff(padded))
+        data = buf.tobytes()
+        words = [data[start:end].decode('utf-8')
+                 for start, end in zip(boundaries[::2].tolist(), boundaries[1::2].tolist())]
         log.info(f"Tokenization. Page contain {len(words)} words.")
-        log.debug(f"Extracted words: {words}")
         return words
 
     @staticmethod
@@ -118,31 +244,75 @@ class HtmlText(HTMLParser):
                      less unique words, all pairs are returned. Defaults to 10.
         :return: List of tuples (word, number of occurrences).
         """
-        word_frequency = {word: words.count(word) for word in set(words)}
+        if count_sorted_ids is not None and len(words) >= _NUMBA_WORDS_THRESHOLD:
+            return HtmlText._find_most_frequent_words_numba(words, max_)
+        word_frequency = Counter(words)
         log.info(f"Ordering by word frequency. Page contain {len(word_frequency)} unique words.")
-        log.debug(f"List of extracted unique words: {word_frequency}")
+        log.debug("List of extracted unique words: %s", word_frequency)
         sorted_frequency = sorted(word_frequency.items(), key=lambda item: (-item[1], item[0]))
-        return sorted_frequency[:min(max_, len(sorted_frequency))]
+        return sorted_frequency[:max_]
+
+    @staticmethod
+    def _find_most_frequent_words_numba(words: list[str], max_: int) -> list[tuple[str, int]]:
+        """
+        Count word occurrences with a numba-jitted routine. Used for very large word lists only.
+
+        Words are mapped to 64-bit hash ids, counted by sort + run-length encoding in compiled code,
+        then mapped back to strings. Order of the result is the same as in find_most_frequent_words.
+        """
+        ids = np.fromiter((hash(word) & 0xFFFFFFFFFFFFFFFF for word in words), dtype=np.uint64, count=len(words))
+        word_of_id = dict(zip(ids.tolist(), words))
+        ids.sort()
+        unique_ids, counts = count_sorted_ids(ids)
+        word_frequency = [(word_of_id[id_], count) for id_, count in zip(unique_ids.tolist(), counts.tolist())]
+        log.info(f"Ordering by word frequency. Page contain {len(word_frequency)} unique words.")
+        return sorted(word_frequency, key=lambda item: (-item[1], item[0]))[:max_]
+
+    def process_document(self, document: str | io.TextIOBase, max_: int = 10) -> list[tuple[str, int]]:
+        """
+        Parse given document (a string or an open text stream, see parse_document) and return its
+        most frequent words along with numbers of occurrences.
+        """
+        parsed_text = self.parse_document(document)
+        if np is not None:
+            words = self._normalize_and_tokenize_numpy(parsed_text)
+        else:
+            words = self.extract_words(parsed_text)
+        return self.find_most_frequent_words(words, max_)
+
+    @classmethod
+    def run_many(cls, urls: list[str], workers: int = 16) -> dict[str, list[tuple[str, int]]]:
+        """
+        Process many pages concurrently. Return a mapping: url -> most frequent words of the page.
+
+        Page fetches are network-bound and urlopen releases the GIL while waiting on the socket, so the
+        pages are fanned out to a thread pool. Every worker uses its own HtmlText instance; the class
+        holds no document state, so instances never cross-contaminate.
+
+        :param urls: List of page urls to process.
+        :param workers: Maximum number of concurrent page fetches. Defaults to 16.
+        :return: Dictionary with urls as keys and lists of tuples (word, number of occurrences) as values.
+        """
+        def process(url: str) -> list[tuple[str, int]]:
+            return cls().process_document(cls.load_from_url(url))
+
+        with ThreadPoolExecutor(max_workers=min(workers, max(len(urls), 1))) as executor:
+            return dict(zip(urls, executor.map(process, urls)))
 
-    def run(self) -> None:
+    def run(self, document: str | io.TextIOBase) -> None:
         """
-        Perform the whole process for loaded document.
+        Perform the whole process for given document (a string or an open text stream, see parse_document).
 
         The most frequent words are both - displayed on screen and stored to `results.txt` file in current directory.
         """
-        self.parse_document()
-        text = self.remove_extra_characters(self.parsed_text)
-        words = self.tokenize(text)
-        sorted_frequency = self.find_most_frequent_words(words, 10)
+        sorted_frequency = self.process_document(document, 10)
+        lines = [f"{i}. {word} - {count}\n" for i, (word, count) in enumerate(sorted_frequency, 1)]
         print("The 10 most frequent words are:")
+        print("".join(lines), end="")
         with open("results.txt", "w") as f:
-            for i in range(len(sorted_frequency)):
-                line = f"{i+1}. {sorted_frequency[i][0]} - {sorted_frequency[i][1]}"
-                print(line)
-                f.write(f"{line}\n")
+            f.writelines(lines)
 
 
 if __name__ == "__main__":
     processor = HtmlText()
-    processor.load_from_url('https://www.volvogroup.com/pl/')
-    processor.run()
+    processor.run(processor.load_from_url('https://www.volvogroup.com/pl/'))
@@ -4,6 +4,7 @@ import os
 
 import pytest
 
+from src import html_text
 from src.html_text import HtmlText
 from test import DATA_DIRECTORY
 
@@ -12,7 +13,8 @@ html_test = HtmlText()
 
 
 def test_load_from_file():
-    html_test.load_from_file(os.path.join(DATA_DIRECTORY, "comment_hidden.html"))
+    document = html_test.load_from_file(os.path.join(DATA_DIRECTORY, "comment_hidden.html"))
+    assert "This is a paragraph." in document
     with pytest.raises(AssertionError):
         html_test.load_from_file("non_existing_file")
 
@@ -24,9 +26,15 @@ def test_load_from_file():
     ("media.html", "\n\n\n\n\n\nHeader 1\nClick on the play button to play a sound:\n\n\n\n")
 ])
 def test_parse_document(filename: str, expected_text: str):
-    html_test.load_from_file(os.path.join(DATA_DIRECTORY, filename))
-    html_test.parse_document()
-    assert html_test.parsed_text == expected_text
+    document = html_test.load_from_file(os.path.join(DATA_DIRECTORY, filename))
+    assert html_test.parse_document(document) == expected_text
+
+
+def test_process_document():
+    document = html_test.load_from_file(os.path.join(DATA_DIRECTORY, "without_tags.html"))
+    expected = [("document", 1), ("in", 1), ("tags", 1), ("text", 1), ("without", 1)]
+    assert html_test.process_document(document) == expected
+    assert html_test.process_document(document, max_=2) == expected[:2]
 
 
 @pytest.mark.parametrize("input_text, expected_text", [
@@ -40,7 +48,9 @@ def test_parse_document(filename: str, expected_text: str):
     ("Hmmm...", "Hmmm "),
     ("First line\nSecond line\tNext tab", "First line Second line Next tab"),
     ("!@#$%^&*()_+-=[]{}<>,./?\\\"':;|", " @#$%^&*  _+ =    <>  / \\   |"),
-    ("kitten&nbsp;9", "kitten9")
+    ("kitten&nbsp;9", "kitten9"),
+    ("12'.", "12."),
+    ("1&nbsp;,a", "1,a")
 ])
 def test_remove_extra_characters(input_text, expected_text):
     assert html_test.remove_extra_characters(input_text) == expected_text
@@ -56,6 +66,38 @@ def test_tokenize(input_text: str, expected_wordlist: list[str]):
     assert html_test.tokenize(input_text) == expected_wordlist
 
 
+# Shared by test_extract_words and test_normalize_and_tokenize_numpy: both are documented to produce
+# the same word list as tokenize(remove_extra_characters(text)).
+EXTRACT_WORDS_CASES = [
+    ("", []),
+    ("Declarative sentence.", ["declarative", "sentence"]),
+    ("Jastrzębie-Zdrój", ["jastrzębie", "zdrój"]),
+    ("world's", ["worlds"]),
+    ("Buy 1,000 items for 12.34$ !!!!", ["buy", "1,000", "items", "for", "12.34$"]),
+    ("Hmmm...", ["hmmm"]),
+    ("kitten&nbsp;9", ["kitten9"]),
+    ("&NBSP;x", ["&nbsp", "x"]),
+    ("12'.", ["12."]),
+    ("1&nbsp;,a", ["1,a"]),
+    ("0'.a", ["0.a"]),
+    ("one\x1ctwo one\x1ctwo", ["one", "two", "one", "two"])
+]
+
+
+@pytest.mark.parametrize("input_text, expected_wordlist", EXTRACT_WORDS_CASES)
+def test_extract_words(input_text: str, expected_wordlist: list[str]):
+    assert html_test.extract_words(input_text) == expected_wordlist
+    assert html_test.extract_words(input_text) == html_test.tokenize(html_test.remove_extra_characters(input_text))
+
+
+@pytest.mark.skipif(html_text.np is None, reason="numpy is not installed")
+@pytest.mark.parametrize("input_text, expected_wordlist", EXTRACT_WORDS_CASES)
+def test_normalize_and_tokenize_numpy(input_text: str, expected_wordlist: list[str]):
+    assert html_test._normalize_and_tokenize_numpy(input_text) == expected_wordlist
+    assert (html_test._normalize_and_tokenize_numpy(input_text)
+            == html_test.tokenize(html_test.remove_extra_characters(input_text)))
+
+
 @pytest.mark.parametrize("input_wordslist, max_, expected_result", [
     ([], 10, []),
     ([""], 10, [("", 1)]),